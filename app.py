@@ -1,6 +1,5 @@
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
 import matplotlib
 from pathlib import Path
 
@@ -18,10 +17,10 @@ matplotlib.rcParams['axes.unicode_minus'] = False
 
 from pathlib import Path
 import json
-import matplotlib.font_manager as fm
 
 
 from engine.calculator import load_rules, calc_all
+from engine.chart import render_comparison_chart
 from engine.pdf_report import build_tax_pdf
 
 # --- 設定 ---
@@ -315,52 +314,17 @@ else:
 # ==============================
 # 圖表 (6:4)
 # ==============================
-import matplotlib.ticker as ticker  
-from matplotlib import font_manager as fm
-
-# ✅ 改成字型檔案路徑（不是字型名稱）
-font_path = "assets/NotoSansTC-Regular.ttf"  
-font_prop = fm.FontProperties(fname=font_path)
-
 col1, col2 = st.columns([0.6, 0.4])
 
 with col1:
-    labels = ["現況_應納稅額", "模擬_應納稅額", "現況_淨所得", "模擬_淨所得"]
     values = [
         results_now["tax_payable"], results_sim["tax_payable"],
         results_now["net_income"], results_sim["net_income"]
     ]
 
-    fig, ax = plt.subplots(figsize=(6, 4))
-    bars = ax.bar(labels, values, color=["#1f77b4", "#ff7f0e", "#1f77b4", "#ff7f0e"])
-
-    # ✅ 用字型檔案指定中文字型
-    ax.set_ylabel("金額 (NT$)", fontproperties=font_prop)
-    ax.set_title("現況 vs 模擬", fontproperties=font_prop)
-
-    # ✅ X 軸標籤也套字型
-    ax.set_xticks(range(len(labels)))
-    ax.set_xticklabels(labels, fontproperties=font_prop)
-
-    # ✅ 關閉科學記號顯示
-    ax.yaxis.set_major_formatter(ticker.StrMethodFormatter("{x:,.0f}"))
-
-    # Y 軸範圍
-    ymax = max(values) * 1.1 if max(values) > 0 else 1
-    ax.set_ylim(0, ymax)
-
-    # 在柱狀圖上顯示數字（同樣套字型）
-    for bar in bars:
-        height = bar.get_height()
-        ax.annotate(f"{height:,.0f}",
-                    xy=(bar.get_x() + bar.get_width() / 2, height),
-                    xytext=(0, 3),
-                    textcoords="offset points",
-                    ha="center", va="bottom",
-                    fontproperties=font_prop)
+    # ✅ 共用同一張圖、相同數值直接取快取
+    st.image(render_comparison_chart(values))
 
-    st.pyplot(fig)
-    
 with col2:
     df = pd.DataFrame({
         "項目": ["應納稅額", "淨所得"],
@@ -16,6 +16,18 @@ def calc_exemption(filing_status: str, dependents: int, elders70: int, rules: di
     return base + extra
 
 
+def calc_itemized(inputs: dict) -> int:
+    """計算列舉扣除合計"""
+    return (
+        inputs.get("donation", 0)
+        + inputs.get("insurance", 0)
+        + inputs.get("medical_birth", 0)
+        + inputs.get("disaster_loss", 0)
+        + inputs.get("mortgage_interest", 0)
+        + inputs.get("house_rent_itemized", 0)
+    )
+
+
 def calc_general_deduction(filing_status: str, itemized: int, rules: dict) -> int:
     """計算一般扣除：標準 vs 列舉取高"""
     standard = (
@@ -68,14 +80,7 @@ def calc_all(inputs: dict, filing_status: str, dependents: int, elders70: int, r
 
     exemption = calc_exemption(filing_status, dependents, elders70, rules)
 
-    itemized = (
-        inputs.get("donation", 0)
-        + inputs.get("insurance", 0)
-        + inputs.get("medical_birth", 0)
-        + inputs.get("disaster_loss", 0)
-        + inputs.get("mortgage_interest", 0)
-        + inputs.get("house_rent_itemized", 0)
-    )
+    itemized = calc_itemized(inputs)
     general_deduction = calc_general_deduction(filing_status, itemized, rules)
 
     special = calc_special_deductions(inputs, filing_status, rules)
@@ -0,0 +1,148 @@
+import atexit
+import logging
+import threading
+import time
+from collections import OrderedDict
+from io import BytesIO
+from pathlib import Path
+
+import matplotlib.ticker as ticker
+from matplotlib import font_manager as fm
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+# --- 字型設定（只載入一次） ---
+FONT_PATH = Path("assets/NotoSansTC-Regular.ttf")
+if FONT_PATH.exists():
+    FONT_PROP = fm.FontProperties(fname=str(FONT_PATH))
+else:
+    # fallback: 交給 rcParams['font.sans-serif'] 決定
+    FONT_PROP = fm.FontProperties()
+
+LABELS = ["現況_應納稅額", "模擬_應納稅額", "現況_淨所得", "模擬_淨所得"]
+COLORS = ["#1f77b4", "#ff7f0e", "#1f77b4", "#ff7f0e"]
+FIGSIZE = (6, 4)
+DPI = 150
+CACHE_SIZE = 64
+
+logger = logging.getLogger(__name__)
+
+# Streamlit 每個 session 跑在不同執行緒，共用的 Figure 與快取都要上鎖
+_lock = threading.Lock()
+_chart = None
+_cache: OrderedDict = OrderedDict()
+_metrics = {
+    "renders": 0,
+    "cache_hits": 0,
+    "last_render_ms": 0.0,
+    "total_render_ms": 0.0,
+}
+
+
+def _build_chart() -> dict:
+    """建立唯一一張 Agg 圖（不經過 pyplot，不會被全域 figure 管理器持有）"""
+    # layout="tight"：避免七位數刻度與 Y 軸標題被裁切（原 st.pyplot 以 bbox_inches="tight" 存檔）
+    fig = Figure(figsize=FIGSIZE, dpi=DPI, layout="tight")
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+
+    bars = ax.bar(range(len(LABELS)), [0] * len(LABELS), color=COLORS)
+
+    ax.set_ylabel("金額 (NT$)", fontproperties=FONT_PROP)
+    ax.set_title("現況 vs 模擬", fontproperties=FONT_PROP)
+    ax.set_xticks(range(len(LABELS)))
+    ax.set_xticklabels(LABELS, fontproperties=FONT_PROP)
+
+    # 關閉科學記號顯示
+    ax.yaxis.set_major_formatter(ticker.StrMethodFormatter("{x:,.0f}"))
+
+    # 柱狀圖上的數字：先建好，之後只更新文字與位置
+    annotations = [
+        ax.annotate("",
+                    xy=(bar.get_x() + bar.get_width() / 2, 0),
+                    xytext=(0, 3),
+                    textcoords="offset points",
+                    ha="center", va="bottom",
+                    fontproperties=FONT_PROP)
+        for bar in bars
+    ]
+
+    return {"fig": fig, "ax": ax, "bars": bars, "annotations": annotations}
+
+
+def _draw(values: tuple) -> bytes:
+    """就地更新柱高與標註後輸出 PNG（呼叫端需持有 _lock）"""
+    global _chart
+    if _chart is None:
+        _chart = _build_chart()
+
+    for bar, ann, value in zip(_chart["bars"], _chart["annotations"], values):
+        bar.set_height(value)
+        ann.xy = (bar.get_x() + bar.get_width() / 2, value)
+        ann.set_text(f"{value:,.0f}")
+
+    # Y 軸範圍
+    ymax = max(values) * 1.1 if max(values) > 0 else 1
+    _chart["ax"].set_ylim(0, ymax)
+
+    buffer = BytesIO()
+    _chart["fig"].savefig(buffer, format="png")
+    return buffer.getvalue()
+
+
+def render_comparison_chart(values: list) -> bytes:
+    """
+    繪製「現況 vs 模擬」柱狀圖，回傳 PNG bytes。
+    相同數值直接回傳快取結果。
+    """
+    if len(values) != len(LABELS):
+        raise ValueError(f"需要 {len(LABELS)} 個數值，收到 {len(values)} 個")
+
+    key = tuple(values)
+
+    with _lock:
+        png = _cache.get(key)
+        if png is not None:
+            _cache.move_to_end(key)
+            _metrics["cache_hits"] += 1
+            logger.debug("chart cache hit: %s", key)
+            return png
+
+        start = time.perf_counter()
+        png = _draw(key)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        _metrics["renders"] += 1
+        _metrics["last_render_ms"] = elapsed_ms
+        _metrics["total_render_ms"] += elapsed_ms
+
+        _cache[key] = png
+        if len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+
+    logger.debug("chart rendered in %.1f ms: %s", elapsed_ms, key)
+
+    return png
+
+
+def get_chart_metrics() -> dict:
+    """回傳繪圖統計（實際繪製次數、快取命中次數、耗時 ms）"""
+    with _lock:
+        metrics = dict(_metrics)
+        metrics["cache_size"] = len(_cache)
+    renders = metrics["renders"]
+    metrics["avg_render_ms"] = metrics["total_render_ms"] / renders if renders else 0.0
+    return metrics
+
+
+def close_chart() -> None:
+    """釋放共用的 Figure 與快取"""
+    global _chart
+    with _lock:
+        if _chart is not None:
+            _chart["fig"].clear()
+            _chart = None
+        _cache.clear()
+
+
+atexit.register(close_chart)
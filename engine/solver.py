@@ -0,0 +1,167 @@
+import numpy as np
+import pandas as pd
+
+from engine.calculator import calc_all, calc_itemized
+
+# 稅額函數為分段線性，以下皆以解析方式反推，不做試算迭代
+
+
+def _bracket_index(net_income: int, rules: dict) -> int:
+    """回傳淨所得所在級距的索引（與 calc_tax 判斷方式一致）"""
+    for i, bracket in enumerate(rules["brackets"]):
+        up_to = bracket["up_to"]
+        if up_to == -1 or net_income <= up_to:
+            return i
+    return len(rules["brackets"])
+
+
+def _salary_cap(filing_status: str, rules: dict) -> int:
+    """薪資特別扣除上限"""
+    salary_people = 1 if filing_status == "單身" else 2
+    return salary_people * rules["special"]["salary"]
+
+
+def required_withholding(inputs: dict, filing_status: str, dependents: int, elders70: int, rules: dict) -> dict:
+    """
+    反推讓 final_tax 與 refund 皆為 0 的預扣稅額。
+    annual：全年應預扣；monthly：每月至少預扣（無條件進位）；
+    adjustment：與目前預扣的差額（正數代表需多扣）。
+    """
+    results = calc_all(inputs, filing_status, dependents, elders70, rules)
+    annual = results["tax_payable"]
+    return {
+        "annual": annual,
+        "monthly": -(-annual // 12),
+        "adjustment": annual - inputs.get("withheld", 0),
+    }
+
+
+def salary_headroom(inputs: dict, filing_status: str, dependents: int, elders70: int, rules: dict) -> int | None:
+    """
+    薪資還能增加多少，淨所得仍留在目前級距內（剛好等於級距上限）。
+    已在最高級距時回傳 None。
+    """
+    results = calc_all(inputs, filing_status, dependents, elders70, rules)
+    idx = _bracket_index(results["net_income"], rules)
+    if idx >= len(rules["brackets"]) or rules["brackets"][idx]["up_to"] == -1:
+        return None
+    up_to = rules["brackets"][idx]["up_to"]
+
+    salary = inputs.get("salary", 0)
+    cap = _salary_cap(filing_status, rules)
+    special_others = results["special"] - min(salary, cap)
+
+    # 目標淨所得 ≤ 上限 ⇒ target_salary ≥ cap，故以 cap 計薪資扣除（此段每多 1 元薪資，淨所得多 1 元）
+    target_salary = (
+        up_to - inputs.get("other_income", 0)
+        + results["exemption"] + results["general_deduction"] + special_others + cap
+    )
+    return target_salary - salary
+
+
+def deduction_to_drop_bracket(inputs: dict, filing_status: str, dependents: int, elders70: int, rules: dict) -> int | None:
+    """
+    需再增加多少列舉扣除支出，淨所得才會降到下一級距（剛好等於下一級距上限）。
+    已在最低級距時回傳 None。
+    """
+    results = calc_all(inputs, filing_status, dependents, elders70, rules)
+    idx = _bracket_index(results["net_income"], rules)
+    if idx == 0 or idx >= len(rules["brackets"]):
+        return None
+    lower = rules["brackets"][idx - 1]["up_to"]
+
+    # 列舉需先補足到標準扣除額，之後每多 1 元支出，淨所得少 1 元
+    needed = results["net_income"] - lower
+    return results["general_deduction"] + needed - calc_itemized(inputs)
+
+
+# ==============================
+# 向量化（批次）版本
+# ==============================
+def _col(df: pd.DataFrame, name: str, default=0) -> np.ndarray:
+    """取欄位，缺少時補預設值"""
+    if name in df.columns:
+        return df[name].fillna(default).to_numpy()
+    return np.full(len(df), default)
+
+
+def calc_tax_vec(net_income: np.ndarray, rules: dict) -> np.ndarray:
+    """calc_tax 的向量化版本"""
+    net_income = np.asarray(net_income, dtype=np.int64)
+    brackets = rules["brackets"]
+    uppers = np.array([np.inf if b["up_to"] == -1 else b["up_to"] for b in brackets])
+    # 最後補一個 0 稅率，對應超出所有級距的情況（與 calc_tax 回傳 0 一致）
+    rates = np.array([b["rate"] for b in brackets] + [0.0])
+    diffs = np.array([b["diff"] for b in brackets] + [0])
+
+    idx = np.searchsorted(uppers, net_income, side="left")
+    tax = np.trunc(net_income * rates[idx] - diffs[idx])
+    return np.maximum(0, tax).astype(np.int64)
+
+
+def solve_batch(df: pd.DataFrame, rules: dict) -> pd.DataFrame:
+    """
+    批次反推（例如整份薪資檔：pd.read_csv(...)）。
+    欄位同 calc_all 的 inputs，另加 filing_status / dependents / elders70；缺欄位視為 0（單身）。
+    回傳與 df 同 index 的結果表，無解的格子為 <NA>。
+    """
+    s = rules["special"]
+    d = rules["deduction"]
+    e = rules["exemption"]
+    brackets = rules["brackets"]
+
+    filing_status = _col(df, "filing_status", "單身")
+    couple = filing_status == "夫妻合併"
+    dependents = _col(df, "dependents").astype(np.int64)
+    elders70 = _col(df, "elders70").astype(np.int64)
+
+    salary = _col(df, "salary").astype(np.int64)
+    other_income = _col(df, "other_income").astype(np.int64)
+    withheld = _col(df, "withheld").astype(np.int64)
+
+    # 免稅額
+    persons = 1 + couple.astype(np.int64) + dependents
+    exemption = persons * e["per_person"] + elders70 * (e["elder70"] - e["per_person"])
+
+    # 一般扣除
+    itemized = sum(
+        _col(df, name).astype(np.int64)
+        for name in ("donation", "insurance", "medical_birth", "disaster_loss",
+                     "mortgage_interest", "house_rent_itemized")
+    )
+    standard = np.where(couple, d["standard_couple"], d["standard_single"])
+    general = np.maximum(standard, itemized)
+
+    # 特別扣除（薪資部分另外拆出）
+    cap = np.where(filing_status == "單身", 1, 2) * s["salary"]
+    special_others = (
+        np.minimum(_col(df, "savings_invest").astype(np.int64), s["savings_investment"])
+        + _col(df, "preschool_first").astype(np.int64) * s["preschool_first"]
+        + _col(df, "preschool_more").astype(np.int64) * s["preschool_second_plus"]
+        + _col(df, "disabled").astype(np.int64) * s["disability"]
+        + _col(df, "ltc").astype(np.int64) * s["long_term_care"]
+        + np.minimum(_col(df, "rent_special").astype(np.int64), s["rent"])
+    )
+
+    net_income = np.maximum(
+        0, salary + other_income - exemption - general - np.minimum(salary, cap) - special_others
+    )
+    tax_payable = calc_tax_vec(net_income, rules)
+
+    # 級距上下限（最高級距無上限、最低級距無下限 → NaN）
+    uppers = np.array([np.nan if b["up_to"] == -1 else b["up_to"] for b in brackets] + [np.nan])
+    lowers = np.array([np.nan] + [np.nan if b["up_to"] == -1 else b["up_to"] for b in brackets])
+    idx = np.searchsorted(np.nan_to_num(uppers[:-1], nan=np.inf), net_income, side="left")
+
+    headroom = uppers[idx] - other_income + exemption + general + special_others + cap - salary
+    to_drop = general + (net_income - lowers[idx]) - itemized
+
+    return pd.DataFrame({
+        "net_income": net_income,
+        "tax_payable": tax_payable,
+        "required_withholding": tax_payable,
+        "monthly_withholding": -(-tax_payable // 12),
+        "withholding_adjustment": tax_payable - withheld,
+        "salary_headroom": pd.array(headroom, dtype="Int64"),
+        "deduction_to_drop_bracket": pd.array(to_drop, dtype="Int64"),
+    }, index=df.index)